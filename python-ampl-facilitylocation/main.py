@@ -1,7 +1,8 @@
 import io
 import os
+import platform
+import sys
 import time
-from platform import uname
 
 import nextmv
 import pandas as pd
@@ -137,8 +138,7 @@ def activate_license() -> str:
 
     # A valid AMPL license has not been configured. When running on Nextmv
     # Cloud, use a special module.
-    system_info = uname()
-    if system_info.system == "Linux" and "aarch64" in system_info.machine:
+    if sys.platform == "linux" and "aarch64" in platform.machine():
         modules.activate("nextmv")
         return "nextmv"
 
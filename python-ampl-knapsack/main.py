@@ -1,6 +1,7 @@
 import os
+import platform
+import sys
 import time
-from platform import uname
 
 import nextmv
 from amplpy import AMPL, modules
@@ -28,6 +29,9 @@ STATUS = [
     {"lb": 500, "ub": 599, "status": "failure"},
 ]
 
+# Status of the solver, indexed by the hundreds bucket of the solve result.
+STATUS_BY_BUCKET = {s["lb"] // 100: s["status"] for s in STATUS}
+
 
 def main() -> None:
     """Entry point for the program."""
@@ -104,14 +108,7 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     if value:
         chosen_items = [item for item in input.data["items"] if ampl.get_variable("x")[item["id"]].value() > 0.9]
 
-    solve_result = ampl.solve_result_num
-    status = "unknown"
-    for s in STATUS:
-        lb = s.get("lb")
-        ub = s.get("ub")
-        if lb is not None and ub is not None and lb <= solve_result <= ub:
-            status = s.get("status")
-            break
+    status = STATUS_BY_BUCKET.get(ampl.solve_result_num // 100, "unknown")
 
     statistics = nextmv.Statistics(
         run=nextmv.RunStatistics(duration=time.time() - start_time),
@@ -159,8 +156,7 @@ def activate_license() -> str:
 
     # A valid AMPL license has not been configured. When running on Nextmv
     # Cloud, use a special module.
-    system_info = uname()
-    if system_info.system == "Linux" and "aarch64" in system_info.machine:
+    if sys.platform == "linux" and "aarch64" in platform.machine():
         modules.activate("nextmv")
         return "nextmv"
 
@@ -1,8 +1,11 @@
 import os
+import platform
+import sys
 import time
-from platform import uname
 
 import nextmv
+import numpy as np
+import pandas as pd
 from amplpy import AMPL, modules
 
 # Duration parameter for the solver.
@@ -28,6 +31,9 @@ STATUS = [
     {"lb": 500, "ub": 599, "status": "failure"},
 ]
 
+# Status of the solver, indexed by the hundreds bucket of the solve result.
+STATUS_BY_BUCKET = {s["lb"] // 100: s["status"] for s in STATUS}
+
 
 def main() -> None:
     """Entry point for the program."""
@@ -61,7 +67,6 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
 
     # Defines the model.
     ampl = AMPL()
-    ampl.reset()
     ampl.read(f"{options.model}/ampl_model.mod")
 
     # Sets the solver and options.
@@ -70,23 +75,23 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     if provider in SUPPORTED_PROVIDER_DURATIONS.keys():
         ampl.option[f"{provider}_options"] = f"{SUPPORTED_PROVIDER_DURATIONS[provider]}={options.duration}"
 
-    # Set the data on the model.
-    ampl.set["R"] = input.data["regions"]
+    # Set the data on the model. The per-region data is passed as a single
+    # DataFrame indexed by region, which also populates the set of regions.
+    region_data = pd.DataFrame(
+        {
+            "cost_transport": input.data["transport_costs"],
+            "quantity_min": input.data["minimum_product_allocations"],
+            "quantity_max": input.data["maximum_product_allocations"],
+            "coefficients_region": input.data["coefficients"]["region"],
+        },
+        index=input.data["regions"],
+    )
+    ampl.set_data(region_data, "R")
     ampl.param["cost_waste"] = input.data["cost_per_wasted_product"]
-    ampl.param["cost_transport"] = {r: input.data["transport_costs"][i] for i, r in enumerate(input.data["regions"])}
     ampl.param["price_min"] = input.data["minimum_product_price"]
     ampl.param["price_max"] = input.data["maximum_product_price"]
-    ampl.param["quantity_min"] = {
-        r: input.data["minimum_product_allocations"][i] for i, r in enumerate(input.data["regions"])
-    }
-    ampl.param["quantity_max"] = {
-        r: input.data["maximum_product_allocations"][i] for i, r in enumerate(input.data["regions"])
-    }
     ampl.param["total_amount_of_supply"] = input.data["total_amount_of_supply"]
     ampl.param["coefficients_intercept"] = input.data["coefficients"]["intercept"]
-    ampl.param["coefficients_region"] = {
-        r: input.data["coefficients"]["region"][i] for i, r in enumerate(input.data["regions"])
-    }
     ampl.param["coefficients_price"] = input.data["coefficients"]["price"]
     ampl.param["coefficients_year_index"] = input.data["coefficients"]["year_index"]
     ampl.param["coefficients_peak"] = input.data["coefficients"]["peak"]
@@ -97,47 +102,38 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     # stdout. Only the output should be printed to stdout.
     ampl.solve(verbose=False)
 
-    # Convert to solution format.
+    # Convert to solution format. The variable values are fetched in bulk,
+    # once per variable, instead of one region at a time.
     objective_val = ampl.get_objective("obj")
+    price = dict(ampl.get_variable("price").get_values().to_list())
+    quantity = dict(ampl.get_variable("quantity").get_values().to_list())
+    sales = dict(ampl.get_variable("sales").get_values().to_list())
+    waste = dict(ampl.get_variable("waste").get_values().to_list())
     solution = {}
     if objective_val:
         solution = {
             "regions": input.data["regions"],
-            "price": {r: round(ampl.get_variable("price")[r].value(), 2) for r in ampl.get_set("R")},
-            "quantity": {r: round(ampl.get_variable("quantity")[r].value(), 8) for r in ampl.get_set("R")},
+            "price": {r: round(v, 2) for r, v in price.items()},
+            "quantity": {r: round(v, 8) for r, v in quantity.items()},
         }
 
-    solve_result = ampl.solve_result_num
-    status = "unknown"
-    for s in STATUS:
-        lb = s.get("lb")
-        ub = s.get("ub")
-        if lb is not None and ub is not None and lb <= solve_result <= ub:
-            status = s.get("status")
-            break
-
-    # calculate expected demand for each region
-    price_solution = ampl.getVariable("price").getValues().toList()
+    status = STATUS_BY_BUCKET.get(ampl.solve_result_num // 100, "unknown")
+
+    # Calculates the expected demand for each region. The demand model is
+    # evaluated for all regions at once.
     coefficients = input.data["coefficients"]
-    expected_demand = {}
-
-    for r in range(len(input.data["regions"])):
-        expected_demand[input.data["regions"][r]] = round(
-            (
-                coefficients["intercept"]
-                + coefficients["price"] * price_solution[r][1]
-                + coefficients["region"][r]
-                + coefficients["year_index"] * (input.data["year"] - 2015)
-                + coefficients["peak"] * input.data["peak"]
-            ),
-            8,
-        )
-    expected_sales = {r: round(ampl.get_variable("sales")[r].value(), 8) for r in ampl.get_set("R")}
-    expected_waste = {r: round(ampl.get_variable("waste")[r].value(), 8) for r in ampl.get_set("R")}
-
-    # Convert -0.0 to 0.0
-    expected_sales = {r: 0.0 if v == -0.0 else v for r, v in expected_sales.items()}
-    expected_waste = {r: 0.0 if v == -0.0 else v for r, v in expected_waste.items()}
+    demand = (
+        coefficients["intercept"]
+        + coefficients["price"] * np.array([price[r] for r in input.data["regions"]])
+        + np.array(coefficients["region"])
+        + coefficients["year_index"] * (input.data["year"] - 2015)
+        + coefficients["peak"] * input.data["peak"]
+    )
+    expected_demand = {r: round(d, 8) for r, d in zip(input.data["regions"], demand.tolist(), strict=True)}
+
+    # Rounds the expected sales and waste. Adding 0.0 converts -0.0 to 0.0.
+    expected_sales = {r: round(v, 8) + 0.0 for r, v in sales.items()}
+    expected_waste = {r: round(v, 8) + 0.0 for r, v in waste.items()}
 
     statistics = nextmv.Statistics(
         run=nextmv.RunStatistics(duration=time.time() - start_time),
@@ -188,8 +184,7 @@ def activate_license() -> str:
 
     # A valid AMPL license has not been configured. When running on Nextmv
     # Cloud, use a special module.
-    system_info = uname()
-    if system_info.system == "Linux" and "aarch64" in system_info.machine:
+    if sys.platform == "linux" and "aarch64" in platform.machine():
         modules.activate("nextmv")
         return "nextmv"
 
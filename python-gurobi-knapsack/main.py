@@ -51,30 +51,26 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     model = gp.Model(env=env)
     model.Params.TimeLimit = options.duration
 
-    # Initializes the linear sums.
-    weights = 0.0
-    values = 0.0
-
-    # Creates the decision variables and adds them to the linear sums.
-    items = []
-    for item in input.data["items"]:
-        item_variable = model.addVar(vtype=GRB.BINARY, name=item["id"])
-        items.append({"item": item, "variable": item_variable})
-        weights += item_variable * item["weight"]
-        values += item_variable * item["value"]
+    # Creates the decision variables, one binary entry per item.
+    items = input.data["items"]
+    item_variables = model.addMVar(len(items), vtype=GRB.BINARY, name=[item["id"] for item in items])
+    variables = item_variables.tolist()
 
     # This constraint ensures the weight capacity of the knapsack will not be
-    # exceeded.
+    # exceeded. The linear expressions are built from the coefficient and
+    # variable lists in one call each.
+    weights = gp.LinExpr([item["weight"] for item in items], variables)
     model.addConstr(weights <= input.data["weight_capacity"])
 
     # Sets the objective function: maximize the value of the chosen items.
+    values = gp.LinExpr([item["value"] for item in items], variables)
     model.setObjective(expr=values, sense=GRB.MAXIMIZE)
 
     # Solves the problem.
     model.optimize()
 
     # Determines which items were chosen.
-    chosen_items = [item["item"] for item in items if item["variable"].X > 0.9]
+    chosen_items = [item for item, value in zip(items, item_variables.X, strict=True) if value > 0.9]
 
     options.provider = "gurobi"
     statistics = nextmv.Statistics(
@@ -90,6 +86,10 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
         ),
     )
 
+    # Frees the model and releases the license held by the environment.
+    model.dispose()
+    env.dispose()
+
     return nextmv.Output(
         options=options,
         solution={"items": chosen_items},
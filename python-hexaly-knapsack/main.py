@@ -50,17 +50,13 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     # Makes the solver write to stderr so that logs show up in Nextmv Console.
     solver.param.verbosity = 1
 
-    # Initializes the linear sums.
-    weights = 0.0
-    values = 0.0
-
-    # Creates the decision variables and adds them to the linear sums.
-    items = []
-    for item in input.data["items"]:
-        item_variable = model.bool()
-        items.append({"item": item, "variable": item_variable})
-        weights += item_variable * item["weight"]
-        values += item_variable * item["value"]
+    # Creates the decision variables.
+    items = input.data["items"]
+    item_variables = [model.bool() for _ in items]
+
+    # Creates the linear sums as single n-ary sum expressions.
+    weights = model.sum(variable * item["weight"] for item, variable in zip(items, item_variables, strict=True))
+    values = model.sum(variable * item["value"] for item, variable in zip(items, item_variables, strict=True))
 
     # This constraint ensures the weight capacity of the knapsack will not be
     # exceeded.
@@ -74,7 +70,7 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     solver.solve()
 
     # Determines which items were chosen.
-    chosen_items = [item["item"] for item in items if item["variable"].value > 0.9]
+    chosen_items = [item for item, variable in zip(items, item_variables, strict=True) if variable.value > 0.9]
 
     options.provider = "hexaly"
     statistics = nextmv.Statistics(
@@ -53,8 +53,10 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     # Sets the objective function: maximize the value of the chosen items.
     status = solver.maximize(values)
 
-    # Determines which items were chosen.
-    chosen_items = [item["item"] for item in items if solver.val(item["variable"]) > 0.9]
+    # Determines which items were chosen. The values of all item variables are
+    # fetched in one call, as solver.val() copies the whole solution each time.
+    item_values = solver.vals([item["variable"] for item in items])
+    chosen_items = [item["item"] for item, value in zip(items, item_values, strict=True) if value > 0.9]
 
     options.version = version("highspy")
 
@@ -2,6 +2,7 @@ import time
 from typing import Any
 
 import nextmv
+import numpy as np
 from ortools.graph.python import min_cost_flow
 
 STATUS = {
@@ -45,92 +46,107 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     if err:
         return err
 
+    workers = input.data["workers"]
+    projects = input.data["projects"]
+    num_workers = len(workers)
+    num_projects = len(projects)
+
     total_available_time = 0
     total_required_time = 0
-    project_to_open_time_units = {}
-    project_to_value = {}
 
-    for worker in input.data["workers"]:
+    for worker in workers:
         total_available_time += worker["available_time"]
 
-    for project in input.data["projects"]:
+    for project in projects:
         total_required_time += project["required_time"]
-        project_to_open_time_units[project["id"]] = project["required_time"]
-        project_to_value[project["id"]] = project["value"]
-
-    start_nodes = []
-    end_nodes = []
-    capacities = []
-    unit_costs = []
-    supply = [total_available_time, -1 * total_required_time]
 
     index_source = 0
     index_sink = 1
     index_dummy_source = 2
     index_dummy_sink = 3
     structure_node_count = 4
+    first_project_node = structure_node_count + num_workers
+
+    # All nodes start without supply; workers and projects keep it that way.
+    supply = [0] * (first_project_node + num_projects)
+    supply[index_source] = total_available_time
+    supply[index_sink] = -1 * total_required_time
 
     # Do we need dummy flows for excess supply or unmet demands?
-    # dummy source
-    if total_available_time < total_required_time:
-        supply.append(total_required_time - total_available_time)
-    else:
-        supply.append(0)
-
-    # dummy sink
-    if total_required_time < total_available_time:
-        supply.append(total_required_time - total_available_time)
-    else:
-        supply.append(0)
-
-    # create edges: source to workers
-    for i in range(0, len(input.data["workers"])):
-        start_nodes.append(index_source)
-        end_nodes.append(structure_node_count + i)
-        capacities.append(input.data["workers"][i]["available_time"])
-        unit_costs.append(0)
-        supply.append(0)
-
-    # create edges: worker to project, consider skills
-    for i in range(0, len(input.data["workers"])):
-        worker = input.data["workers"][i]
-        for j in range(0, len(input.data["projects"])):
-            project = input.data["projects"][j]
-            is_contained = all(element in worker["skills"] for element in project["required_skills"])
-            if is_contained:
-                start_nodes.append(structure_node_count + i)
-                end_nodes.append(structure_node_count + len(input.data["workers"]) + j)
-                capacities.append(worker["available_time"])  # assignment of a worker to a project
-                unit_costs.append(-1 * round(project["value"] / project["required_time"], 2))
-
-    # create edges: project to sink
-    for i in range(0, len(input.data["projects"])):
-        start_nodes.append(structure_node_count + len(input.data["workers"]) + i)
-        end_nodes.append(index_sink)
-        capacities.append(input.data["projects"][i]["required_time"])
-        unit_costs.append(0)
-        supply.append(0)
-
-    # create edges: workers to dummy sink
-    workers_to_dummy_sink_indices = []
-    for i in range(0, len(input.data["workers"])):
-        workers_to_dummy_sink_indices.append(len(start_nodes))
-        start_nodes.append(structure_node_count + i)
-        end_nodes.append(index_dummy_sink)
-        capacities.append(input.data["workers"][i]["available_time"])
-        unit_costs.append(0)
-
-    # create edges: dummy source to projects
-    dummy_source_to_project_indices = []
-    for i in range(0, len(input.data["projects"])):
-        dummy_source_to_project_indices.append(len(start_nodes))
-        start_nodes.append(index_dummy_source)
-        end_nodes.append(structure_node_count + len(input.data["workers"]) + i)
-        if total_required_time - total_available_time < 0:
-            capacities.append(0)
-        else:
-            capacities.append(total_required_time - total_available_time)
-        unit_costs.append(options.penalty)
+    # dummy source: supplies the missing time units
+    supply[index_dummy_source] = max(total_required_time - total_available_time, 0)
+    # dummy sink: absorbs the excess time units
+    supply[index_dummy_sink] = min(total_required_time - total_available_time, 0)
+
+    # The edges are built as NumPy arrays, one block per edge type, and handed
+    # to the solver in a single call.
+    worker_nodes = structure_node_count + np.arange(num_workers)
+    project_nodes = first_project_node + np.arange(num_projects)
+    available_times = np.array([worker["available_time"] for worker in workers], dtype=np.int64)
+    required_times = np.array([project["required_time"] for project in projects], dtype=np.int64)
+    unit_values = np.array([round(project["value"] / project["required_time"], 2) for project in projects])
+
+    # A worker can be assigned to a project if they have all of its skills.
+    # Each skill is mapped to a bit, so the check becomes a single bitwise
+    # test per pair: the project mask has no bits outside the worker mask.
+    skill_bits = {}
+    for skills in [worker["skills"] for worker in workers] + [project["required_skills"] for project in projects]:
+        for skill in skills:
+            skill_bits.setdefault(skill, 1 << len(skill_bits))
+    worker_masks = np.array([sum(skill_bits[s] for s in set(worker["skills"])) for worker in workers], dtype=object)
+    project_masks = np.array(
+        [sum(skill_bits[s] for s in set(project["required_skills"])) for project in projects], dtype=object
+    )
+    compatible = (project_masks[np.newaxis, :] & ~worker_masks[:, np.newaxis]) == 0
+    pair_workers, pair_projects = np.nonzero(compatible)
+
+    # Dummy source to projects only carries flow if time units are missing.
+    dummy_capacity = max(total_required_time - total_available_time, 0)
+
+    # The blocks are: source to workers, worker to project (considering
+    # skills), project to sink, workers to dummy sink and dummy source to
+    # projects.
+    start_nodes = np.concatenate(
+        [
+            np.full(num_workers, index_source),
+            worker_nodes[pair_workers],
+            project_nodes,
+            worker_nodes,
+            np.full(num_projects, index_dummy_source),
+        ]
+    )
+    end_nodes = np.concatenate(
+        [
+            worker_nodes,
+            project_nodes[pair_projects],
+            np.full(num_projects, index_sink),
+            np.full(num_workers, index_dummy_sink),
+            project_nodes,
+        ]
+    )
+    capacities = np.concatenate(
+        [
+            available_times,
+            available_times[pair_workers],  # assignment of a worker to a project
+            required_times,
+            available_times,
+            np.full(num_projects, dummy_capacity),
+        ]
+    )
+    unit_costs = np.concatenate(
+        [
+            np.zeros(num_workers),
+            -1 * unit_values[pair_projects],
+            np.zeros(num_projects),
+            np.zeros(num_workers),
+            np.full(num_projects, options.penalty),
+        ]
+    )
+    workers_to_dummy_sink_start = num_workers + len(pair_workers) + num_projects
+    workers_to_dummy_sink_indices = np.arange(workers_to_dummy_sink_start, workers_to_dummy_sink_start + num_workers)
+    dummy_source_to_project_indices = np.arange(
+        workers_to_dummy_sink_start + num_workers, workers_to_dummy_sink_start + num_workers + num_projects
+    )
 
     solver = min_cost_flow.SimpleMinCostFlow()
 
@@ -144,17 +160,13 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     wall_time = end - start
 
     solution_flows = solver.flows(all_arcs)
-    costs = solution_flows * unit_costs * -1
+    costs = -solution_flows * unit_costs
 
     # Creates the statistics.
     # Compute the number of time units required from the dummy source
-    dummy_source_units = 0
-    for idx in dummy_source_to_project_indices:
-        dummy_source_units += int(solution_flows[idx])
+    dummy_source_units = int(solution_flows[dummy_source_to_project_indices].sum())
     # Compute the number of time units that are in excess
-    dummy_sink_units = 0
-    for idx in workers_to_dummy_sink_indices:
-        dummy_sink_units += int(solution_flows[idx])
+    dummy_sink_units = int(solution_flows[workers_to_dummy_sink_indices].sum())
 
     statistics = nextmv.Statistics(
         run=nextmv.RunStatistics(duration=time.time() - start_time),
@@ -164,8 +176,8 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
             custom={
                 "number_of_edges": solver.num_arcs(),
                 "number_of_nodes": solver.num_nodes(),
-                "number_of_workers": len(input.data["workers"]),
-                "number_of_projects": len(input.data["projects"]),
+                "number_of_workers": num_workers,
+                "number_of_projects": num_projects,
                 "available_time_units": total_available_time,
                 "required_time_units": total_required_time,
                 "excess_time_units": dummy_sink_units,
@@ -183,48 +195,55 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     # fulfilled (only considers projects that don't need the dummy source)
     solution = {"flows": [], "assignments": [], "status": STATUS.get(status, "unknown")}
     if status == min_cost_flow.SimpleMinCostFlow.OPTIMAL or status == min_cost_flow.SimpleMinCostFlow.FEASIBLE:
-        total_value = 0
-        fulfilled_projects = 0
-        for i in range(0, len(solution_flows)):
-            solution["flows"].append(
+        flows = solution_flows.tolist()
+        solution["flows"] = [
+            {"from": s, "to": e, "flow": f, "capacity": c, "value": v}
+            for s, e, f, c, v in zip(
+                start_nodes.tolist(),
+                end_nodes.tolist(),
+                flows,
+                capacities.tolist(),
+                costs.astype(int).tolist(),
+                strict=True,
+            )
+        ]
+
+        # look at the flows between workers and projects to get the assignments
+        is_assignment = (
+            (solution_flows > 0)
+            & (start_nodes >= structure_node_count)
+            & (start_nodes < first_project_node)
+            & (end_nodes >= first_project_node)
+            & (end_nodes < first_project_node + num_projects)
+        )
+        for i in np.flatnonzero(is_assignment).tolist():
+            project = projects[end_nodes[i] - first_project_node]
+            worker = workers[start_nodes[i] - structure_node_count]
+            solution["assignments"].append(
                 {
-                    "from": start_nodes[i],
-                    "to": end_nodes[i],
-                    "flow": int(solution_flows[i]),
-                    "capacity": int(capacities[i]),
-                    "value": int(costs[i]),
+                    "project": project["id"],
+                    "worker": worker["id"],
+                    "value": project["value"],
+                    "time_units": flows[i],
                 }
             )
 
-            # look at the flows between workers and projects to get the assignments
-            if (
-                solution_flows[i] > 0
-                and start_nodes[i] != 0
-                and end_nodes[i] != 1
-                and start_nodes[i] != 2
-                and end_nodes[i] != 3
-            ):
-                project_id = input.data["projects"][end_nodes[i] - 4 - len(input.data["workers"])]["id"]
-                solution["assignments"].append(
-                    {
-                        "project": project_id,
-                        "worker": input.data["workers"][start_nodes[i] - 4]["id"],
-                        "value": input.data["projects"][end_nodes[i] - 4 - len(input.data["workers"])]["value"],
-                        "time_units": int(solution_flows[i]),
-                    }
-                )
-
-                # Compute the number of projects that can be fulfilled with workers
-                project_to_open_time_units[project_id] -= int(solution_flows[i])
-
-        for pid in project_to_open_time_units:
-            if project_to_open_time_units[pid] == 0:
-                total_value += project_to_value[pid]
-                fulfilled_projects += 1
+        # Compute the number of projects that can be fulfilled with workers:
+        # the time assigned to a project must cover all of its required time.
+        assigned_times = np.bincount(
+            end_nodes[is_assignment] - first_project_node,
+            weights=solution_flows[is_assignment],
+            minlength=num_projects,
+        )
+        is_fulfilled = (assigned_times == required_times).tolist()
+        fulfilled_projects = sum(is_fulfilled)
+        total_value = sum(
+            project["value"] for project, fulfilled in zip(projects, is_fulfilled, strict=True) if fulfilled
+        )
 
         solution["total_value_of_fulfilled_projects"] = total_value
         statistics.result.custom["number_of_fulfilled_projects"] = fulfilled_projects
-        statistics.result.custom["number_of_unfulfilled_projects"] = len(input.data["projects"]) - fulfilled_projects
+        statistics.result.custom["number_of_unfulfilled_projects"] = num_projects - fulfilled_projects
 
         return nextmv.Output(
             options=options,
@@ -236,14 +255,10 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
 def validateSkills(input: nextmv.Input) -> Any:
     """Check that each project skill and each worker skill have a skill pair."""
 
-    for project in input.data["projects"]:
-        for skill in project["required_skills"]:
-            if not any(skill in worker["skills"] for worker in input.data["workers"]):
-                return errorStatusOutput("input_skill_error", input.options)
-    for worker in input.data["workers"]:
-        for skill in worker["skills"]:
-            if not any(skill in project["required_skills"] for project in input.data["projects"]):
-                return errorStatusOutput("input_skill_error", input.options)
+    worker_skills = set().union(*(worker["skills"] for worker in input.data["workers"]))
+    project_skills = set().union(*(project["required_skills"] for project in input.data["projects"]))
+    if project_skills - worker_skills or worker_skills - project_skills:
+        return errorStatusOutput("input_skill_error", input.options)
     return None
 
 
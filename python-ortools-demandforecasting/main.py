@@ -7,6 +7,7 @@ from itertools import groupby
 from operator import itemgetter
 
 import nextmv
+import numpy as np
 from ortools.linear_solver import pywraplp
 
 BLOCKS = {
@@ -31,6 +32,17 @@ BLOCKS = {
         "length": 12,
     },
 }
+# Coefficients of the demand model, in the order of the feature columns.
+COEFFICIENTS = [
+    "offset",
+    "daily",
+    "seasonal_cos",
+    "seasonal_sin",
+    "solar_cos",
+    "solar_sin",
+    "weekly_cos",
+    "weekly_sin",
+]
 STATUS = {
     pywraplp.Solver.FEASIBLE: "suboptimal",
     pywraplp.Solver.INFEASIBLE: "infeasible",
@@ -92,35 +104,30 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
             "weekly_sin": solver.NumVar(-bigm, bigm, f"{block}[weekly_sin"),
         }
 
+    # Finds the day index of each demand, as demands are grouped by date, and
+    # computes the features of the demand model for all of them at once.
+    days = []
+    for i, (_, group) in enumerate(groupby(demands, itemgetter("date"))):
+        days.extend([i] * len(list(group)))
+    demand_features = features(np.array(days, dtype=float)).tolist()
+
     fittings = []
     residuals = []
-    for i, (_, group) in enumerate(groupby(demands, itemgetter("date"))):
-        for g in group:
-            subscript = f"[{i}][{g['block']}]"
-            fitted = solver.NumVar(-bigm, bigm, f"fitted{subscript}")
-            residual = solver.NumVar(0, bigm, f"residual{subscript}")
-
-            fittings.append(fitted)
-            residuals.append(residual)
-
-            a = 2.0 * math.pi * i
-            x = block_vars[g["block"]]
-            solver.Add(
-                fitted
-                == x["offset"]
-                + (i * x["daily"])
-                + (math.cos(a / 365.25) * x["seasonal_cos"])
-                + (math.sin(a / 365.25) * x["seasonal_sin"])
-                + (math.cos(a / (10.66 * 365.25)) * x["solar_cos"])
-                + (math.sin(a / (10.66 * 365.25)) * x["solar_sin"])
-                + (math.cos(a / 7) * x["weekly_cos"])
-                + (math.sin(a / 7) * x["weekly_sin"])
-            )
+    for g, i, row in zip(demands, days, demand_features, strict=True):
+        subscript = f"[{i}][{g['block']}]"
+        fitted = solver.NumVar(-bigm, bigm, f"fitted{subscript}")
+        residual = solver.NumVar(0, bigm, f"residual{subscript}")
+
+        fittings.append(fitted)
+        residuals.append(residual)
+
+        x = block_vars[g["block"]]
+        solver.Add(fitted == solver.Sum([f * x[name] for f, name in zip(row, COEFFICIENTS, strict=True)]))
 
-            solver.Add(residual >= g["demand"] - fitted)
-            solver.Add(residual >= fitted - g["demand"])
+        solver.Add(residual >= g["demand"] - fitted)
+        solver.Add(residual >= fitted - g["demand"])
 
-    solver.Minimize(sum(residuals))
+    solver.Minimize(solver.Sum(residuals))
     status = solver.Solve()
 
     # Add fitted data into training set.
@@ -129,31 +136,34 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
 
     # Forecast unknown demand.
     forecast = []
-    date = datetime.strptime(demands[-1]["date"], "%Y-%m-%d")
+    date = datetime.strptime(demands[-1]["date"], "%Y-%m-%d").replace(tzinfo=zoneinfo.ZoneInfo(timezone_name))
+    # The fitted coefficients are read once per block, and the forecasts of all
+    # days and blocks are computed together. The terms are added one feature at
+    # a time in the order of COEFFICIENTS, like a scalar sum would, so a forecast
+    # close to an integer yields the same count after math.ceil.
+    coefficients = np.array([[block_vars[block][name].solution_value() for name in COEFFICIENTS] for block in BLOCKS])
+    forecast_features = features((len(demands) / len(BLOCKS)) + np.arange(28, dtype=float))
+    predictions = np.zeros((len(forecast_features), len(BLOCKS)))
+    for feature, coefficient in zip(forecast_features.T, coefficients.T, strict=True):
+        predictions += feature[:, None] * coefficient
+    predictions = predictions.tolist()
+    # The block details are unpacked once, in order, for the forecast loop.
+    blocks = [
+        (block, info["hours"], timedelta(hours=info["hours_int"]), timedelta(hours=info["length"]))
+        for block, info in BLOCKS.items()
+    ]
     for i in range(28):
-        j = (len(demands) / len(BLOCKS)) + i
-        for block in BLOCKS.keys():
-            a = 2.0 * math.pi * j
-            x = block_vars[block]
-            y = (
-                x["offset"].solution_value()
-                + (j * x["daily"].solution_value())
-                + (math.cos(a / 365.25) * x["seasonal_cos"].solution_value())
-                + (math.sin(a / 365.25) * x["seasonal_sin"].solution_value())
-                + (math.cos(a / (10.66 * 365.25)) * x["solar_cos"].solution_value())
-                + (math.sin(a / (10.66 * 365.25)) * x["solar_sin"].solution_value())
-                + (math.cos(a / 7) * x["weekly_cos"].solution_value())
-                + (math.sin(a / 7) * x["weekly_sin"].solution_value())
-            )
+        day = date.strftime("%Y-%m-%d")
+        for b, (block, hours, start_offset, length) in enumerate(blocks):
+            y = predictions[i][b]
 
-            date = date.replace(tzinfo=zoneinfo.ZoneInfo(timezone_name))
-            start_time = date + timedelta(hours=BLOCKS[block]["hours_int"])
-            end_time = start_time + timedelta(hours=BLOCKS[block]["length"])
+            start_time = date + start_offset
+            end_time = start_time + length
 
             forecast.append(
                 {
-                    "when": f"{date.strftime('%Y-%m-%d')} {BLOCKS[block]['hours']}",
-                    "date": date.strftime("%Y-%m-%d"),
+                    "when": f"{day} {hours}",
+                    "date": day,
                     "block": block,
                     "forecast": y,
                     # Output for next stage
@@ -164,18 +174,18 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
             )
         date += timedelta(days=1)
 
-        statistics = nextmv.Statistics(
-            run=nextmv.RunStatistics(duration=time.time() - start_timer),
-            result=nextmv.ResultStatistics(
-                duration=solver.WallTime() / 1000,
-                value=solver.Objective().Value(),
-                custom={
-                    "status": STATUS.get(status, "unknown"),
-                    "variables": solver.NumVariables(),
-                    "constraints": solver.NumConstraints(),
-                },
-            ),
-        )
+    statistics = nextmv.Statistics(
+        run=nextmv.RunStatistics(duration=time.time() - start_timer),
+        result=nextmv.ResultStatistics(
+            duration=solver.WallTime() / 1000,
+            value=solver.Objective().Value(),
+            custom={
+                "status": STATUS.get(status, "unknown"),
+                "variables": solver.NumVariables(),
+                "constraints": solver.NumConstraints(),
+            },
+        ),
+    )
 
     return nextmv.Output(
         options=options,
@@ -184,5 +194,26 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     )
 
 
+def features(days: np.ndarray) -> np.ndarray:
+    """
+    Returns the features of the demand model for the given day indices, one
+    row per day and one column per entry in COEFFICIENTS.
+    """
+
+    a = 2.0 * np.pi * days
+    return np.column_stack(
+        [
+            np.ones_like(days),
+            days,
+            np.cos(a / 365.25),
+            np.sin(a / 365.25),
+            np.cos(a / (10.66 * 365.25)),
+            np.sin(a / (10.66 * 365.25)),
+            np.cos(a / 7),
+            np.sin(a / 7),
+        ]
+    )
+
+
 if __name__ == "__main__":
     main()
@@ -49,17 +49,15 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     solver = pywraplp.Solver.CreateSolver(options.provider)
     solver.SetTimeLimit(options.duration * 1000)
 
-    # Initializes the linear sums.
-    weights = 0.0
-    values = 0.0
-
-    # Creates the decision variables and adds them to the linear sums.
+    # Creates the decision variables.
     items = []
     for item in input.data["items"]:
         item_variable = solver.IntVar(0, 1, item["id"])
         items.append({"item": item, "variable": item_variable})
-        weights += item_variable * int(item["weight"])
-        values += item_variable * int(item["value"])
+
+    # Creates the linear sums, each in a single solver.Sum call.
+    weights = solver.Sum([item["variable"] * int(item["item"]["weight"]) for item in items])
+    values = solver.Sum([item["variable"] * int(item["item"]["value"]) for item in items])
 
     # This constraint ensures the weight capacity of the knapsack will not be
     # exceeded.
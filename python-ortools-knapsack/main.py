@@ -1,4 +1,6 @@
+import math
 import time
+from typing import Any
 
 import nextmv
 from ortools.linear_solver import pywraplp
@@ -23,6 +25,7 @@ def main() -> None:
         nextmv.Parameter("output", str, "", "Path to output file. Default is stdout.", False),
         nextmv.Parameter("duration", int, 30, "Max runtime duration (in seconds).", False),
         nextmv.Parameter("provider", str, "SCIP", "Solver provider.", False),
+        nextmv.Parameter("presolve_only", bool, False, "Return the greedy solution without solving.", False),
     )
 
     input = nextmv.load_local(options=options, path=options.input)
@@ -41,21 +44,40 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     start_time = time.time()
     nextmv.redirect_stdout()  # Solver chatter is logged to stderr.
 
+    # Picks items greedily. This solution is returned as is in presolve-only
+    # mode, which skips the solver start-up cost, and is used as a hint for the
+    # solver otherwise.
+    greedy_picks = greedy(input.data["items"], input.data["weight_capacity"])
+    if options.presolve_only:
+        chosen_items = [item for item, picked in zip(input.data["items"], greedy_picks, strict=True) if picked]
+        statistics = nextmv.Statistics(
+            run=nextmv.RunStatistics(duration=time.time() - start_time),
+            result=nextmv.ResultStatistics(
+                duration=0,
+                value=sum(item["value"] for item in chosen_items),
+                custom={"status": "suboptimal"},
+            ),
+        )
+
+        return nextmv.Output(
+            options=options,
+            solution={"items": chosen_items},
+            statistics=statistics,
+        )
+
     # Creates the solver.
     solver = pywraplp.Solver.CreateSolver(options.provider)
     solver.SetTimeLimit(options.duration * 1000)
 
-    # Initializes the linear sums.
-    weights = 0.0
-    values = 0.0
-
-    # Creates the decision variables and adds them to the linear sums.
+    # Creates the decision variables.
     items = []
     for item in input.data["items"]:
         item_variable = solver.IntVar(0, 1, item["id"])
         items.append({"item": item, "variable": item_variable})
-        weights += item_variable * item["weight"]
-        values += item_variable * item["value"]
+
+    # Creates the linear sums, each in a single solver.Sum call.
+    weights = solver.Sum([item["variable"] * item["item"]["weight"] for item in items])
+    values = solver.Sum([item["variable"] * item["item"]["value"] for item in items])
 
     # This constraint ensures the weight capacity of the knapsack will not be
     # exceeded.
@@ -64,6 +86,9 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     # Sets the objective function: maximize the value of the chosen items.
     solver.Maximize(values)
 
+    # Starts the search from the greedy solution.
+    solver.SetHint([item["variable"] for item in items], [float(picked) for picked in greedy_picks])
+
     # Solves the problem.
     status = solver.Solve()
 
@@ -90,5 +115,25 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     )
 
 
+def greedy(items: list[dict[str, Any]], capacity: float) -> list[bool]:
+    """
+    Picks items by decreasing value-to-weight ratio, skipping the ones that no
+    longer fit in the knapsack. Returns whether each item is picked.
+    """
+
+    picks = [False] * len(items)
+    order = sorted(
+        range(len(items)),
+        key=lambda i: items[i]["value"] / items[i]["weight"] if items[i]["weight"] > 0 else math.inf,
+        reverse=True,
+    )
+    for i in order:
+        if items[i]["weight"] <= capacity:
+            picks[i] = True
+            capacity -= items[i]["weight"]
+
+    return picks
+
+
 if __name__ == "__main__":
     main()
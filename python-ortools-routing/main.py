@@ -1,4 +1,3 @@
-import functools
 import numbers
 import time
 from typing import Any
@@ -63,27 +62,28 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     # Create Routing Model.
     routing = pywrapcp.RoutingModel(manager)
 
-    # Define transit callbacks.
-    def distance_matrix_callback(from_index: int, to_index: int, speed: float):
-        """Returns the duration between the two nodes based on the distance_matrix."""
-        from_node, to_node = manager.IndexToNode(from_index), manager.IndexToNode(to_index)
-        duration = int(distance_matrix[from_node][to_node] / speed + durations[to_node])
-        return duration
-
-    def duration_matrix_callback(from_index: int, to_index: int):
-        """Returns the duration between the two nodes based on the duration_matrix."""
-        from_node, to_node = manager.IndexToNode(from_index), manager.IndexToNode(to_index)
-        duration = duration_matrix[from_node][to_node] + durations[to_node]
-        return duration
-
-    # Create and register the duration callback.
-    duration_callbacks = [
-        duration_matrix_callback
-        if "duration_matrix" in input.data
-        else functools.partial(distance_matrix_callback, speed=speed)
-        for speed in speeds
-    ]
-    transit_callbacks = [routing.RegisterTransitCallback(callback) for callback in duration_callbacks]
+    # Define transit matrices. They are registered with the solver directly, so arcs are
+    # evaluated without calling back into Python during the search.
+    node_durations = np.array(durations)
+
+    def distance_transit_matrix(speed: float) -> list[list[int]]:
+        """Returns the durations between all nodes based on the distance_matrix."""
+        return (distance_matrix / speed + node_durations).astype(int).tolist()
+
+    def duration_transit_matrix() -> list[list[int]]:
+        """Returns the durations between all nodes based on the duration_matrix."""
+        return (duration_matrix + node_durations).tolist()
+
+    # Create and register the duration matrices. With a duration_matrix all vehicles share a single one,
+    # otherwise there is one per distinct speed.
+    matrix_keys = [None] * len(speeds) if "duration_matrix" in input.data else speeds
+    transit_matrix_by_key, transit_callback_by_key = {}, {}
+    for key in matrix_keys:
+        if key not in transit_callback_by_key:
+            matrix = duration_transit_matrix() if key is None else distance_transit_matrix(key)
+            transit_matrix_by_key[key] = matrix
+            transit_callback_by_key[key] = routing.RegisterTransitMatrix(matrix)
+    transit_callbacks = [transit_callback_by_key[key] for key in matrix_keys]
     routing.AddDimensionWithVehicleTransitAndCapacity(
         transit_callbacks,  # transit callback for each vehicle
         0,  # slack
@@ -94,13 +94,8 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     for i in range(len(input.data["vehicles"])):
         routing.SetArcCostEvaluatorOfVehicle(transit_callbacks[i], i)
 
-    # Define capacity callback.
-    def capacity_callback(from_index):
-        """Returns the quantity to pickup/dropoff at the node."""
-        return quantities[manager.IndexToNode(from_index)]
-
-    # Create and register the capacity callback.
-    demand_callback_index = routing.RegisterUnaryTransitCallback(capacity_callback)
+    # Register the quantity to pickup/dropoff at each node.
+    demand_callback_index = routing.RegisterUnaryTransitVector(quantities)
     routing.AddDimensionWithVehicleCapacity(
         demand_callback_index,
         0,  # null capacity slack
@@ -130,7 +125,8 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
         for vehicle_index in range(len(input.data["vehicles"])):
             # Get the route for the vehicle.
             input_vehicle = input.data["vehicles"][vehicle_index]
-            current_index, previous_index = routing.Start(vehicle_index), -1
+            transit_matrix = transit_matrix_by_key[matrix_keys[vehicle_index]]
+            current_index, previous_index, previous_node = routing.Start(vehicle_index), -1, -1
             route_duration, stop_count = 0, 0
             vehicle_route = []
 
@@ -142,13 +138,10 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
                 if node_index < len(input.data["stops"]):
                     stop_count += 1
 
-                # Calculate cumulative duration.
-                if previous_index > 0:
-                    route_duration += routing.GetArcCostForVehicle(
-                        previous_index,
-                        current_index,
-                        vehicle_index,
-                    )
+                # Calculate cumulative duration. The arc cost of the vehicle is its transit matrix entry, except
+                # for an unused vehicle going from its start straight to its end, which costs nothing.
+                if previous_index > 0 and stop_count > 0:
+                    route_duration += transit_matrix[previous_node][node_index]
 
                 # Add the stop to the route. If it is a start/end location, assemble it on the fly.
                 if node_index < len(input.data["stops"]):
@@ -175,7 +168,7 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
                         )
 
                 # Keep traversing the route.
-                previous_index = current_index
+                previous_index, previous_node = current_index, node_index
                 if routing.IsEnd(current_index):
                     current_index = -1
                 else:
@@ -229,18 +222,16 @@ def apply_defaults(input_data: dict[str, Any]) -> None:
     (if they are given and not already set on them directly).
     """
     if "defaults" not in input_data:
-        return input_data
+        return
     defaults = input_data["defaults"]
     if "vehicles" in defaults:
         for vehicle in input_data["vehicles"]:
             for key, value in defaults["vehicles"].items():
-                if key not in vehicle:
-                    vehicle[key] = value
+                vehicle.setdefault(key, value)
     if "stops" in defaults:
         for stop in input_data["stops"]:
             for key, value in defaults["stops"].items():
-                if key not in stop:
-                    stop[key] = value
+                stop.setdefault(key, value)
 
 
 def check_valid_location(element: dict[str, Any]) -> bool:
@@ -344,33 +335,28 @@ def calculate_distance_matrix(input_data: dict[str, Any]) -> np.ndarray:
     """
     # Otherwise, calculate the distance matrix from the locations using the haversine formula.
     start = time.time()
-    lats_origin = np.array([s["location"]["lat"] for s in input_data["stops"]])
-    for vehicle in input_data["vehicles"]:
-        lats_origin = np.append(lats_origin, vehicle["start_location"]["lat"])
-        lats_origin = np.append(lats_origin, vehicle["end_location"]["lat"])
-    lons_origin = np.array([s["location"]["lon"] for s in input_data["stops"]])
+    locations = [s["location"] for s in input_data["stops"]]
     for vehicle in input_data["vehicles"]:
-        lons_origin = np.append(lons_origin, vehicle["start_location"]["lon"])
-        lons_origin = np.append(lons_origin, vehicle["end_location"]["lon"])
-    lats_destination = np.copy(lats_origin)
-    lons_destination = np.copy(lons_origin)
-
-    # Create the combination of all origins and destinations.
-    lats_origin = np.repeat(lats_origin, len(lats_destination))
-    lons_origin = np.repeat(lons_origin, len(lons_destination))
-    lats_destination = np.tile(lats_destination, len(lats_destination))
-    lons_destination = np.tile(lons_destination, len(lons_destination))
-
-    distances = haversine(
-        lats_origin=lats_origin,
-        lons_origin=lons_origin,
-        lats_destination=lats_destination,
-        lons_destination=lons_destination,
-    )
-
-    # Convert the distances to a square matrix.
-    num_locations = len(input_data["stops"]) + 2 * len(input_data["vehicles"])
-    matrix = distances.reshape(num_locations, num_locations)
+        locations += [vehicle["start_location"], vehicle["end_location"]]
+    lats = np.radians(np.asarray([location["lat"] for location in locations], dtype=np.float64))
+    lons = np.radians(np.asarray([location["lon"] for location in locations], dtype=np.float64))
+    cos_lats = np.cos(lats)
+
+    # Broadcast origins (rows) against destinations (columns) to get the square matrix directly. This is
+    # done in blocks of rows, so the intermediate arrays stay small and cache-resident for large inputs.
+    # The radians and cosines are computed once above and shared by all blocks.
+    matrix = np.empty((len(lats), len(lats)))
+    block_size = 256
+    for block_start in range(0, len(lats), block_size):
+        rows = slice(block_start, block_start + block_size)
+        matrix[rows] = haversine(
+            lats_origin=lats[rows, None],
+            lons_origin=lons[rows, None],
+            cos_lats_origin=cos_lats[rows, None],
+            lats_destination=lats[None, :],
+            lons_destination=lons[None, :],
+            cos_lats_destination=cos_lats[None, :],
+        )
 
     end = time.time()
     nextmv.log(f"Distance matrix calculation took {round(end - start, 2)} seconds.")
@@ -408,26 +394,35 @@ def process_duration_matrix(input_data: dict[str, Any]) -> None:
 
 
 def haversine(
-    lats_origin: np.ndarray | float,
-    lons_origin: np.ndarray | float,
-    lats_destination: np.ndarray | float,
-    lons_destination: np.ndarray | float,
-) -> np.ndarray | float:
-    """Calculates the haversine distance between arrays of coordinates."""
-
-    lons_destination, lats_destination, lons_origin, lats_origin = map(
-        np.radians,
-        [lons_destination, lats_destination, lons_origin, lats_origin],
-    )
-    delta_lon = lons_destination - lons_origin
-    delta_lat = lats_destination - lats_origin
-    term1 = np.sin(delta_lat / 2.0) ** 2
-    term2 = np.cos(lats_origin) * np.cos(lats_destination) * np.sin(delta_lon / 2.0) ** 2
-    a = term1 + term2
-    c = 2 * np.arcsin(np.sqrt(a))
+    lats_origin: np.ndarray,
+    lons_origin: np.ndarray,
+    cos_lats_origin: np.ndarray,
+    lats_destination: np.ndarray,
+    lons_destination: np.ndarray,
+    cos_lats_destination: np.ndarray,
+) -> np.ndarray:
+    """
+    Calculates the haversine distance between arrays of coordinates given in
+    radians, along with the cosines of their latitudes. The intermediate
+    results are computed in place to avoid temporary arrays.
+    """
+
+    a = lats_destination - lats_origin
+    a *= 0.5
+    np.sin(a, out=a)
+    np.square(a, out=a)
+    term2 = lons_destination - lons_origin
+    term2 *= 0.5
+    np.sin(term2, out=term2)
+    np.square(term2, out=term2)
+    term2 *= cos_lats_origin * cos_lats_destination
+    a += term2
+    np.sqrt(a, out=a)
+    np.arcsin(a, out=a)
+    a *= 2
     earth_radius = 6371000
 
-    return earth_radius * c
+    return earth_radius * a
 
 
 if __name__ == "__main__":
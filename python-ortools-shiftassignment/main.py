@@ -1,4 +1,6 @@
+import bisect
 import datetime
+import itertools
 import time
 from typing import Any
 
@@ -48,85 +50,83 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     # Prepare data
     workers, shifts, rules_per_worker = convert_input(input.data)
 
-    # Create binary variables indicating whether an worker is assigned to a shift
-    x_assign = {}
-    for e in workers:
-        for s in shifts:
-            x_assign[(e["id"], s["id"])] = solver.BoolVar(f'Assignment_{e["id"]}_{s["id"]}')
+    # Create binary variables indicating whether an worker is assigned to a shift. They are stored per worker
+    # in shift order, so x_assign[w][s] is looked up by position rather than by hashing id tuples.
+    x_assign = [[solver.BoolVar(f'Assignment_{e["id"]}_{s["id"]}') for s in shifts] for e in workers]
 
     # >>> Constraints
 
+    # The constraints are created as rows and filled coefficient by coefficient, which avoids building
+    # and parsing an intermediate linear expression for each of them.
+
     # Each shift must have the required number of workers
-    for s in shifts:
-        solver.Add(
-            solver.Sum([x_assign[(e["id"], s["id"])] for e in workers]) == s["count"],
-            f"Shift_{s['id']}",
-        )
+    for s_index, s in enumerate(shifts):
+        constraint = solver.RowConstraint(s["count"], s["count"], f"Shift_{s['id']}")
+        for worker_assign in x_assign:
+            constraint.SetCoefficient(worker_assign[s_index], 1)
 
     # Each worker must be assigned to at least their minimum number of shifts
-    for e in workers:
+    for e, worker_assign in zip(workers, x_assign, strict=True):
         rules = rules_per_worker[e["id"]]
-        solver.Add(
-            solver.Sum([x_assign[(e["id"], s["id"])] for s in shifts]) >= rules["min_shifts"],
-            f"worker_{e['id']}",
-        )
+        constraint = solver.RowConstraint(rules["min_shifts"], solver.infinity(), f"worker_{e['id']}")
+        for variable in worker_assign:
+            constraint.SetCoefficient(variable, 1)
 
     # Each worker must be assigned to at most their maximum number of shifts
-    for e in workers:
+    for e, worker_assign in zip(workers, x_assign, strict=True):
         rules = rules_per_worker[e["id"]]
-        solver.Add(
-            solver.Sum([x_assign[(e["id"], s["id"])] for s in shifts]) <= rules["max_shifts"],
-            f"worker_{e['id']}",
-        )
-
-    # Ensure that the minimum rest time between shifts is respected
-    for e in workers:
-        rest_time = datetime.timedelta(hours=rules_per_worker[e["id"]]["min_rest_hours_between_shifts"])
-        for s1, shift1 in enumerate(shifts):
-            for s2, shift2 in enumerate(shifts):
-                if s1 >= s2:
-                    continue
-                if (
-                    shift1["end_time"] + rest_time < shift2["start_time"]
-                    or shift2["end_time"] + rest_time < shift1["start_time"]
-                ):
-                    continue
-                # The two shifts are closer to each other than the minimum rest time, so we need to ensure that
-                # the worker is not assigned to both.
-                solver.Add(
-                    x_assign[(e["id"], shift1["id"])] + x_assign[(e["id"], shift2["id"])] <= 1,
-                    f"Rest_{e['id']}_{shift1['id']}_{shift2['id']}",
-                )
-
-    # Ensure that availabilities are respected
-    for e in workers:
-        for s in shifts:
-            if not any(
-                a["start_time"] <= s["start_time"] and a["end_time"] >= s["end_time"] for a in e["availability"]
-            ):
-                x_assign[(e["id"], s["id"])].SetBounds(0, 0)
+        constraint = solver.RowConstraint(-solver.infinity(), rules["max_shifts"], f"worker_{e['id']}")
+        for variable in worker_assign:
+            constraint.SetCoefficient(variable, 1)
+
+    # Ensure that the minimum rest time between shifts is respected. The conflicting shift pairs only
+    # depend on the rest time, so they are determined once per distinct rest time.
+    conflicts_per_rest_time = {}
+    for e, worker_assign in zip(workers, x_assign, strict=True):
+        rest_hours = rules_per_worker[e["id"]]["min_rest_hours_between_shifts"]
+        if rest_hours not in conflicts_per_rest_time:
+            conflicts_per_rest_time[rest_hours] = rest_conflicts(shifts, datetime.timedelta(hours=rest_hours))
+        for s1, s2 in conflicts_per_rest_time[rest_hours]:
+            shift1, shift2 = shifts[s1], shifts[s2]
+            # The two shifts are closer to each other than the minimum rest time, so we need to ensure that
+            # the worker is not assigned to both.
+            constraint = solver.RowConstraint(-solver.infinity(), 1, f"Rest_{e['id']}_{shift1['id']}_{shift2['id']}")
+            constraint.SetCoefficient(worker_assign[s1], 1)
+            constraint.SetCoefficient(worker_assign[s2], 1)
+
+    # Ensure that availabilities are respected. The availabilities are sorted by start time, so a shift is
+    # covered if the latest end among the availabilities starting before it is not before the shift ends.
+    for e, worker_assign in zip(workers, x_assign, strict=True):
+        availability_starts = [a["start_time"] for a in e["availability"]]
+        latest_ends = list(itertools.accumulate((a["end_time"] for a in e["availability"]), max))
+        for s, variable in zip(shifts, worker_assign, strict=True):
+            index = bisect.bisect_right(availability_starts, s["start_time"]) - 1
+            if index < 0 or latest_ends[index] < s["end_time"]:
+                variable.SetBounds(0, 0)
 
     # Ensure that workers are qualified for the shift
-    for e in workers:
-        for s in shifts:
+    for e, worker_assign in zip(workers, x_assign, strict=True):
+        for s, variable in zip(shifts, worker_assign, strict=True):
             if "qualification" not in s or s["qualification"] == "":
                 # No qualifications required for shift (worker can be assigned)
                 continue
             if "qualifications" not in e:
                 # A qualification is required for the shift, but the worker has none (worker cannot be assigned)
-                x_assign[(e["id"], s["id"])].SetBounds(0, 0)
+                variable.SetBounds(0, 0)
                 continue
             if s["qualification"] not in e["qualifications"]:
                 # The worker does not have the required qualification (worker cannot be assigned)
-                x_assign[(e["id"], s["id"])].SetBounds(0, 0)
+                variable.SetBounds(0, 0)
 
     # >>> Objective
+    # Only the positive preferences contribute, so they are mapped to their shifts directly instead of
+    # looking up a preference for every worker and shift.
+    shift_index = {s["id"]: s_index for s_index, s in enumerate(shifts)}
     objective = solver.Objective()
-    for e in workers:
-        for s in shifts:
-            pref = e["preferences"].get(s["id"], 0)
-            if pref > 0:
-                objective.SetCoefficient(x_assign[(e["id"], s["id"])], pref)
+    for e, worker_assign in zip(workers, x_assign, strict=True):
+        for shift_id, pref in e["preferences"].items():
+            if pref > 0 and shift_id in shift_index:
+                objective.SetCoefficient(worker_assign[shift_index[shift_id]], pref)
     objective.SetMaximization()
 
     # Solves the problem.
@@ -145,9 +145,9 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
                     "worker_id": e["id"],
                     "shift_id": s["id"],
                 }
-                for e in workers
-                for s in shifts
-                if x_assign[(e["id"], s["id"])].solution_value() > 0.5
+                for e, worker_assign in zip(workers, x_assign, strict=True)
+                for s, variable in zip(shifts, worker_assign, strict=True)
+                if variable.solution_value() > 0.5
             ],
         }
         active_workers = len({s["worker_id"] for s in schedule["assigned_shifts"]})
@@ -176,24 +176,45 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     )
 
 
+def rest_conflicts(shifts: list[dict[str, Any]], rest_time: datetime.timedelta) -> list[tuple[int, int]]:
+    """
+    Returns the sorted index pairs (s1 < s2) of shifts that are closer to each
+    other than the given rest time. Shifts are swept in order of their start
+    time, so each shift is only compared to the shifts starting before its end
+    plus the rest time.
+    """
+    order = sorted(range(len(shifts)), key=lambda i: shifts[i]["start_time"])
+    starts = [shifts[i]["start_time"] for i in order]
+    conflicts = []
+    for position, s1 in enumerate(order):
+        window_end = bisect.bisect_right(starts, shifts[s1]["end_time"] + rest_time, lo=position + 1)
+        for s2 in order[position + 1 : window_end]:
+            if shifts[s1]["start_time"] <= shifts[s2]["end_time"] + rest_time:
+                conflicts.append((min(s1, s2), max(s1, s2)))
+
+    return sorted(conflicts)
+
+
 def convert_input(input_data: dict[str, Any]) -> tuple[list, list, dict]:
     """Converts the input data to the format expected by the model."""
     workers = input_data["workers"]
     shifts = input_data["shifts"]
 
-    # In-place convert timestamps to datetime objects
-    for s in shifts:
-        s["start_time"] = datetime.datetime.fromisoformat(s["start_time"])
-        s["end_time"] = datetime.datetime.fromisoformat(s["end_time"])
-    for e in workers:
-        for a in e["availability"]:
-            a["start_time"] = datetime.datetime.fromisoformat(a["start_time"])
-            a["end_time"] = datetime.datetime.fromisoformat(a["end_time"])
-
-    # Add default values for rules
+    # In-place convert timestamps to datetime objects. Shifts and availabilities tend to share timestamps,
+    # so each distinct one is only parsed once.
+    timestamps = {}
+    for interval in itertools.chain(shifts, (a for e in workers for a in e["availability"])):
+        for key in ("start_time", "end_time"):
+            if interval[key] not in timestamps:
+                timestamps[interval[key]] = datetime.datetime.fromisoformat(interval[key])
+            interval[key] = timestamps[interval[key]]
+
+    # Add default values for rules and group them by id
+    rules_by_id = {}
     for r in input_data["rules"]:
         r["min_shifts"] = r.get("min_shifts", 0)
         r["max_shifts"] = r.get("max_shifts", 1000)
+        rules_by_id.setdefault(r["id"], []).append(r)
 
     # Add default values for workers
     for e in workers:
@@ -213,7 +234,7 @@ def convert_input(input_data: dict[str, Any]) -> tuple[list, list, dict]:
     # Convert rules to dict
     rules_per_worker = {}
     for e in workers:
-        rule = [r for r in input_data.get("rules", {}) if r["id"] == e["rules"]]
+        rule = rules_by_id.get(e["rules"], [])
         if len(rule) != 1:
             raise ValueError(f"Invalid rule for worker {e['id']}")
         rules_per_worker[e["id"]] = rule[0]
@@ -61,28 +61,33 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     solver = pyo.SolverFactory(provider)
     solver.options[SUPPORTED_PROVIDER_DURATIONS[provider]] = options.duration
 
-    # Initializes the linear sums.
-    weights = 0.0
-    values = 0.0
+    # Creates the set of items and their weight and value parameters.
+    model.item_ids = pyo.Set(initialize=[item["id"] for item in input.data["items"]])
+    model.item_weight = pyo.Param(
+        model.item_ids,
+        initialize={item["id"]: item["weight"] for item in input.data["items"]},
+    )
+    model.item_value = pyo.Param(
+        model.item_ids,
+        initialize={item["id"]: item["value"] for item in input.data["items"]},
+    )
 
     # Creates the decision variables.
-    item_ids = [item["id"] for item in input.data["items"]]
-    model.item_variable = pyo.Var(item_ids, domain=pyo.Boolean)
-
-    # Use the decision variables for the linear sums
-    items = []
-    for item in input.data["items"]:
-        item_id = item["id"]
-        items.append({"item": item, "variable": model.item_variable[item_id]})
-        weights += model.item_variable[item_id] * item["weight"]
-        values += model.item_variable[item_id] * item["value"]
+    model.item_variable = pyo.Var(model.item_ids, domain=pyo.Boolean)
 
     # This constraint ensures the weight capacity of the knapsack will not be
-    # exceeded.
-    model.constraint = pyo.Constraint(expr=weights <= input.data["weight_capacity"])
+    # exceeded. The sums are built with quicksum to get a single flat
+    # expression instead of a chain of additions.
+    model.constraint = pyo.Constraint(
+        expr=pyo.quicksum(model.item_weight[i] * model.item_variable[i] for i in model.item_ids)
+        <= input.data["weight_capacity"]
+    )
 
     # Sets the objective function: maximize the value of the chosen items.
-    model.objective = pyo.Objective(expr=values, sense=pyo.maximize)
+    model.objective = pyo.Objective(
+        expr=pyo.quicksum(model.item_value[i] * model.item_variable[i] for i in model.item_ids),
+        sense=pyo.maximize,
+    )
 
     # Solves the problem.
     results = solver.solve(model, tee=False)  # Set tee to True for Pyomo logging.
@@ -91,7 +96,7 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     value = pyo.value(model.objective, exception=False)
     chosen_items = []
     if value:
-        chosen_items = [item["item"] for item in items if item["variable"]() > 0.9]
+        chosen_items = [item for item in input.data["items"] if model.item_variable[item["id"]].value > 0.9]
 
     statistics = nextmv.Statistics(
         run=nextmv.RunStatistics(duration=time.time() - start_time),
@@ -84,7 +84,7 @@ def solve(input: nextmv.Input, options: nextmv.Options) -> nextmv.Output:
     statistics = nextmv.Statistics(
         run=nextmv.RunStatistics(duration=time.time() - start),
         result=nextmv.ResultStatistics(
-            value=sum(item["value"] for item in chosen_items),
+            value=model.get_model_attribute(poi.ModelAttribute.ObjectiveValue),
             custom={
                 "status": str(status),
                 "variables": model.number_of_variables(),